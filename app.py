@@ -1,5 +1,7 @@
 import os
-from flask import Flask, request, send_file, jsonify
+import shutil
+from flask import Flask, request, send_from_directory, jsonify
+from werkzeug.exceptions import NotFound
 from flask_cors import CORS
 from api import process_omics_data
 import pandas as pd
@@ -118,11 +120,13 @@ def upload_file():
     
     # Save uploaded file
     file_path = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-    file.save(file_path)
+    with open(file_path, 'wb') as dst:
+        shutil.copyfileobj(file.stream, dst, length=1 << 20)  # 1 MiB chunks
     
     # Validate CSV file content
     try:
-        df = pd.read_csv(file_path)
+        # Only the header and first row are needed to validate the file
+        df = pd.read_csv(file_path, nrows=1)
         #### print(df)
         # Check if CSV is empty
         if df.empty:
@@ -175,15 +179,31 @@ def download_results():
         
         zip_path = os.path.join(app.config['RESULTS_FOLDER'], 'omics_results.zip')
         
-        # Create zip file with all result images
-        with zipfile.ZipFile(zip_path, 'w') as zipf:
-            for root, dirs, files in os.walk(app.config['RESULTS_FOLDER']):
-                for file in files:
-                    if file.endswith(('.png', '.svg', '.jpg')):
-                        file_path = os.path.join(root, file)
-                        zipf.write(file_path, arcname=file)
+        # Collect all result images
+        with os.scandir(app.config['RESULTS_FOLDER']) as entries:
+            images = [e for e in entries
+                      if e.is_file() and e.name.endswith(('.png', '.svg', '.jpg'))]
         
-        return send_file(zip_path, as_attachment=True)
+        # Only rebuild the zip when an image is newer than the existing one
+        # or the set of images (by name and size) no longer matches it
+        latest_image = max((e.stat().st_mtime for e in images), default=0)
+        rebuild = True
+        if os.path.exists(zip_path) and os.path.getmtime(zip_path) > latest_image:
+            try:
+                with zipfile.ZipFile(zip_path) as zipf:
+                    archived = {(i.filename, i.file_size) for i in zipf.infolist()}
+                rebuild = archived != {(e.name, e.stat().st_size) for e in images}
+            except zipfile.BadZipFile:
+                pass
+        
+        if rebuild:
+            # Images are already compressed, so store them as-is
+            with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_STORED) as zipf:
+                for e in images:
+                    zipf.write(e.path, arcname=e.name)
+        
+        return send_from_directory(app.config['RESULTS_FOLDER'], 'omics_results.zip',
+                                   as_attachment=True, conditional=True, max_age=3600)
     except Exception as e:
         return jsonify({
             'error': 'Download error',
@@ -198,7 +218,9 @@ def view_results():
     """
     try:
         results_folder = app.config['RESULTS_FOLDER']
-        image_files = [f for f in os.listdir(results_folder) if f.endswith(('.png', '.svg', '.jpg'))]
+        with os.scandir(results_folder) as entries:
+            image_files = [e.name for e in entries
+                           if e.is_file() and e.name.endswith(('.png', '.svg', '.jpg'))]
         
         if not image_files:
             return jsonify({
@@ -223,8 +245,10 @@ def get_result_image(filename):
     Serve a specific result image
     """
     try:
-        return send_file(os.path.join(app.config['RESULTS_FOLDER'], filename))
-    except FileNotFoundError:
+        # Conditional responses let browsers revalidate via ETag/Last-Modified
+        return send_from_directory(app.config['RESULTS_FOLDER'], filename,
+                                   conditional=True, max_age=3600)
+    except NotFound:
         return jsonify({
             'error': 'Image not found',
             'message': f'Image {filename} does not exist'